@@ -7,6 +7,7 @@ This script simulates different scenarios to show timestamps in logs.
 import sys
 import os
 import tempfile
+import json
 from unittest.mock import patch, Mock
 import requests
 
@@ -18,6 +19,9 @@ os.environ['MC_SERVER'] = 'test.example.com:19132'
 
 import monitor
 
+# Each scenario simulates a separate check, don't reuse the previous API answer
+monitor.RESPONSE_TTL = 0
+
 def print_separator(title=""):
     print("\n" + "="*70)
     if title:
@@ -34,18 +38,19 @@ def demo_scenario_1():
         temp_path = f.name
     
     try:
-        with patch.object(monitor, 'DATA_FILE', temp_path):
+        with patch.object(monitor.SERVERS[0], 'data_file', temp_path):
             with patch('monitor.session') as mock_session:
                 # Mock successful API response
                 mock_response = Mock()
                 mock_response.status_code = 200
                 mock_response.raise_for_status.return_value = None
-                mock_response.json.return_value = {
+                mock_response.headers = {}
+                mock_response.content = json.dumps({
                     "online": True,
                     "players": {"online": 3, "max": 10},
                     "version": "1.21.2",
                     "gamemode": "Survival"
-                }
+                }).encode()
                 mock_session.get.return_value = mock_response
                 
                 print("Simulating server coming online...")
@@ -53,7 +58,7 @@ def demo_scenario_1():
                 print()
                 
                 # Call check_server (first check)
-                monitor.check_server(0, None, "", "Unknown", set())
+                monitor.check_server(monitor.MonitorState())
                 
     finally:
         if os.path.exists(temp_path):
@@ -67,7 +72,7 @@ def demo_scenario_2():
         temp_path = f.name
     
     try:
-        with patch.object(monitor, 'DATA_FILE', temp_path):
+        with patch.object(monitor.SERVERS[0], 'data_file', temp_path):
             with patch('monitor.session') as mock_session:
                 # Simulate connection error
                 mock_session.get.side_effect = requests.exceptions.ConnectionError("Network unreachable")
@@ -77,7 +82,7 @@ def demo_scenario_2():
                 print()
                 
                 # Call check_server
-                monitor.check_server(5, True, "Survival", "1.21.0", set())
+                monitor.check_server(monitor.MonitorState(5, True, "Survival", "1.21.0"))
                 
     finally:
         if os.path.exists(temp_path):
@@ -91,25 +96,26 @@ def demo_scenario_3():
         temp_path = f.name
     
     try:
-        with patch.object(monitor, 'DATA_FILE', temp_path):
+        with patch.object(monitor.SERVERS[0], 'data_file', temp_path):
             with patch('monitor.send_discord_notification') as mock_discord:
                 with patch('monitor.session') as mock_session:
                     # Mock successful API response
                     mock_response = Mock()
                     mock_response.status_code = 200
                     mock_response.raise_for_status.return_value = None
-                    mock_response.json.return_value = {
+                    mock_response.headers = {}
+                    mock_response.content = json.dumps({
                         "online": False,
                         "players": {"online": 0, "max": 10},
                         "version": "1.21.0"
-                    }
+                    }).encode()
                     mock_session.get.return_value = mock_response
                     
                     print("Simulating server going offline...")
                     print()
                     
                     # Call check_server
-                    monitor.check_server(3, True, "Survival", "1.21.0", set())
+                    monitor.check_server(monitor.MonitorState(3, True, "Survival", "1.21.0"))
                     
                     print("\nDiscord notification that would be sent:")
                     print("-" * 40)
@@ -1,297 +1,864 @@
 import os
 import sys
+import atexit
+import queue
+import threading
+import signal
+import logging
+from logging.handlers import QueueHandler, QueueListener
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ReadTimeoutError
+from urllib3.util import Retry
 import time
-import json
-from datetime import datetime
-from discord_webhook import DiscordWebhook
+import random
+import re
+import hashlib
+from dataclasses import dataclass
+from typing import NamedTuple, Optional
+import orjson
 
-# Create a persistent session for connection pooling
-session = requests.Session()
+class _TimestampFormatter(logging.Formatter):
+    """Formats records as "[YYYY-MM-DD HH:MM:SS] message".
+
+    Bursts of log lines within the same second reuse the formatted timestamp
+    instead of calling strftime for every record.
+    """
+
+    def __init__(self, fmt="[%(asctime)s] %(message)s"):
+        super().__init__(fmt)
+        # (epoch second, formatted timestamp), swapped atomically
+        self._cached = (None, "")
+
+    def formatTime(self, record, datefmt=None):
+        now = int(record.created)
+        second, timestamp = self._cached
+        if now != second:
+            timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+            self._cached = (now, timestamp)
+        return timestamp
+
+class _StdoutHandler(logging.StreamHandler):
+    """StreamHandler that writes to whatever sys.stdout currently is, so
+    redirecting stdout (e.g. in tests) keeps working."""
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+logger = logging.getLogger("mc-monitor")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+_log_handler = _StdoutHandler()
+_log_handler.setFormatter(_TimestampFormatter())
+logger.addHandler(_log_handler)
+_log_listener = None
 
 def log(message):
-    """Print a message to stdout with a timestamp prefix."""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    print(f"[{timestamp}] {message}")
+    """Log a message to stdout with a timestamp prefix."""
+    logger.info(message)
+
+def start_log_listener():
+    """Move log formatting and stdout writes onto a background listener thread."""
+    global _log_listener
+    if _log_listener is not None:
+        return
+    log_queue = queue.Queue()
+    _log_listener = QueueListener(log_queue, _log_handler)
+    logger.removeHandler(_log_handler)
+    logger.addHandler(QueueHandler(log_queue))
+    _log_listener.start()
+    # Write out anything still queued on a normal interpreter exit
+    atexit.register(_log_listener.stop)
 
 # Configuration from environment variables
 MC_SERVER = os.getenv("MC_SERVER")
+# Comma-separated servers to monitor from this one process, defaults to MC_SERVER
+MC_SERVERS = list(dict.fromkeys(
+    server.strip() for server in (os.getenv("MC_SERVERS") or MC_SERVER or "").split(",") if server.strip()
+))
 SERVER_TYPE = os.getenv("SERVER_TYPE", "BEDROCK").upper()  # Default to BEDROCK, but prepare for JAVA
 
-if not MC_SERVER:
+if not MC_SERVERS:
     # Fail fast if the required MC_SERVER variable isn't provided. This avoids
     # accidentally shipping a hardcoded third-party server in your repository.
     log("Error: environment variable MC_SERVER is not set.\n" \
           "Please set MC_SERVER (for example: play.example.com:19132) " \
-          "in your environment or .env file.")
+          "or a comma-separated MC_SERVERS in your environment or .env file.")
     sys.exit(1)
 
 if SERVER_TYPE not in ["BEDROCK", "JAVA"]:
     log("Error: SERVER_TYPE must be either 'BEDROCK' or 'JAVA'")
     sys.exit(1)
 
+# WARNING silences the routine notification lines and keeps API and delivery problems
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+if LOG_LEVEL not in ["DEBUG", "INFO", "WARNING", "ERROR"]:
+    log("Error: LOG_LEVEL must be one of 'DEBUG', 'INFO', 'WARNING' or 'ERROR'")
+    sys.exit(1)
+logger.setLevel(LOG_LEVEL)
+
 # API Configuration
 API_BASE_URL = "https://api.mcsrvstat.us"
 API_VERSION = "3"
-API_URL = f"{API_BASE_URL}/{'bedrock/' if SERVER_TYPE == 'BEDROCK' else ''}{API_VERSION}/{MC_SERVER}"
 CHECK_INTERVAL = int(os.getenv("CHECK_INTERVAL", "300"))  # Default: 5 minutes
-DATA_FILE = "/app/data/server_data.json"  # Fixed path for data storage
+MAX_CHECK_INTERVAL = int(os.getenv("MAX_CHECK_INTERVAL", "1800"))  # Upper bound while the server is offline
+MIN_CHECK_INTERVAL = 30  # Lower bound while players are active
+ACTIVE_CHECKS = 3  # Checks to keep polling faster after a change
+MAX_FAILURE_BACKOFF = 3600  # Upper bound while the API keeps failing
+# How long an API answer is reused instead of querying again. Half the
+# shortest interval the monitor loop ever waits, so it only absorbs repeated
+# checks (e.g. check_server called again right away) and never a scheduled one.
+RESPONSE_TTL = min(CHECK_INTERVAL, MIN_CHECK_INTERVAL) / 2
+DATA_DIR = "/app/data"
+DATA_FILE = f"{DATA_DIR}/server_data.json"  # Fixed path for data storage when monitoring a single server
 DISCORD_WEBHOOK_URL = os.getenv("DISCORD_WEBHOOK_URL", "")
 REQUEST_TIMEOUT = 10  # Timeout for API requests in seconds
 
-def load_previous_data():
-    """Load previous server and player data from a file."""
-    try:
-        with open(DATA_FILE, "r") as f:
-            data = json.load(f)
-            return (
-                data.get("online_count", 0),
-                data.get("server_status", None),
-                data.get("gamemode", ""),
-                data.get("server_type", SERVER_TYPE),
-                data.get("version", "Unknown"),
-                set(data.get("player_names", []))  # Load player names as a set
-            )
-    except FileNotFoundError:
-        return 0, None, "", SERVER_TYPE, "Unknown", set()  # Default values with current server type
-    except json.JSONDecodeError:
-        return 0, None, "", SERVER_TYPE, "Unknown", set()  # Default values with current server type
-
-def save_current_data(online_count, server_status, gamemode, version, player_names=None):
-    """Save current server and player data to a file."""
-    # Create data directory if it doesn't exist
-    os.makedirs(os.path.dirname(DATA_FILE), exist_ok=True)
+@dataclass
+class Server:
+    """A monitored server: where to query it, where its state is stored and
+    what the API last answered for it.
+
+    Each server is only ever checked from its own monitor thread, so the
+    mutable fields need no locking.
+    """
+    address: str
+    api_url: str
+    data_file: str
+    # Validators of the last successful API response, sent back as If-None-Match
+    # and If-Modified-Since so an unchanged status can be answered with an empty 304
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    # (blake2b digest, extracted _ServerStatus) of the last API response body, so
+    # an identical body doesn't need to be parsed again. Treated as read-only.
+    last_response: Optional[tuple] = None
+    # Number of checks in a row that couldn't get a usable answer from the API
+    consecutive_failures: int = 0
+    # time.monotonic() of the last answer from the API, for RESPONSE_TTL
+    answered_at: Optional[float] = None
+
+@dataclass(slots=True)
+class MonitorState:
+    """Last known state of a monitored server, updated in place by check_server.
+
+    server defaults to the first configured server.
+    """
+    online_count: int = 0
+    server_status: Optional[bool] = None  # None until the first successful check
+    gamemode: str = ""
+    version: str = "Unknown"
+    player_names: frozenset = frozenset()  # Never mutated, replaced as a whole
+    server: Optional[Server] = None
+
+SERVERS = [
+    Server(
+        address,
+        f"{API_BASE_URL}/{'bedrock/' if SERVER_TYPE == 'BEDROCK' else ''}{API_VERSION}/{address}",
+        # Keep the original data file for a single server so upgrading doesn't lose its state
+        DATA_FILE if len(MC_SERVERS) == 1 else f"{DATA_DIR}/{address}.json"
+    )
+    for address in MC_SERVERS
+]
+
+# Create a persistent session for connection pooling. All monitored servers
+# are queried on the same API host, so they share one pool with a connection
+# per monitor thread, and the TLS connections are reused across polls
+# instead of re-handshaking every check. Quick transient failures (failed
+# connects, 5xx) are retried twice within the check before it counts as
+# failed; the final error response is still raised by raise_for_status so
+# it's logged with its status code. Read timeouts and rate limiting (429)
+# aren't retried, and Retry-After is ignored: a check must stay short since
+# SIGTERM can't interrupt it, and the monitor loop backs off failed checks.
+session = requests.Session()
+session.mount("https://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=max(2, len(SERVERS)),
+    max_retries=Retry(total=2, read=0, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504),
+                      allowed_methods=("GET",), raise_on_status=False, respect_retry_after_header=False)
+))
+# Add User-Agent header as required by the API
+session.headers.update({
+    "User-Agent": "MC-Server-Discord-Monitor (https://github.com/Philipovic/mc-bedrock-monitor)"
+})
+
+# Separate session for Discord webhooks so the TLS connection to Discord is
+# reused across notifications instead of being set up for every message. Only
+# the notification worker posts, so a single pooled connection is enough.
+# Failed connects and rate limiting (429, honouring Retry-After) are retried;
+# other errors aren't, since Discord may already have posted the message.
+discord_session = requests.Session()
+discord_session.mount("https://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=1,
+    max_retries=Retry(total=2, read=0, backoff_factor=0.3, status_forcelist=(429,), allowed_methods=("POST",),
+                      raise_on_status=False)
+))
+
+# Log labels for request failures, looked up along the exception's MRO
+_REQUEST_ERROR_LABELS = {
+    requests.exceptions.ConnectionError: "connection error",  # Network down, DNS failure, API unreachable
+    requests.exceptions.Timeout: "timeout",
+}
+
+# Shared read-only default for missing objects in the API response
+_EMPTY_DICT = {}
+# Player names are passed around as frozensets; this is the shared empty one
+_NO_PLAYERS = frozenset()
+
+# Matches the "icon" field (with one adjoining comma) in the raw API response
+_ICON_FIELD_RE = re.compile(rb',"icon":"[^"]*"|"icon":"[^"]*",')
+
+# Decoded contents of each data file, loaded on first use and kept in sync
+# by save_current_data so the file is read at most once per process
+_state_cache = {}
+
+# Pending (path, payload) writes, drained by the background writer thread
+_write_queue = queue.Queue()
+_writer_thread = None
+
+# Pending Discord messages, drained by the notification worker thread
+DISCORD_MAX_LENGTH = 1900  # Stay below Discord's 2000 character message limit
+DISCORD_COALESCE_WINDOW = 0.5  # Seconds to wait for more messages before sending
+_discord_queue = queue.Queue()
+_discord_thread = None
+
+# Set on SIGTERM or SIGINT to end the monitor loops at their next wait
+_shutdown = threading.Event()
+_shutdown_signal = None  # The signal that requested the shutdown, logged by the monitor loops
+
+def _get_state(path):
+    """Return the in-memory copy of a data file, reading it from disk on first use."""
+    state = _state_cache.get(path)
+    if state is None:
+        try:
+            with open(path, "rb") as f:
+                state = orjson.loads(f.read())
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            state = {}
+        _state_cache[path] = state
+    return state
+
+def load_previous_data(server=None):
+    """Load a server's last known state from its data file as a MonitorState.
+
+    Also restores the API response validators saved alongside the data, so
+    the first check after a restart can already be a conditional request.
+    server defaults to the first configured server.
+    """
+    server = server or SERVERS[0]
+    data = _get_state(server.data_file)
+    server.etag = data.get("etag")
+    server.last_modified = data.get("last_modified")
+    
+    # Warn if server type has changed since last run
+    stored_server_type = data.get("server_type", SERVER_TYPE)
+    if stored_server_type and stored_server_type != SERVER_TYPE:
+        logger.warning("Warning: Server type has changed from %s to %s", stored_server_type, SERVER_TYPE)
+    
+    return MonitorState(
+        data.get("online_count", 0),
+        data.get("server_status", None),
+        data.get("gamemode", ""),
+        data.get("version", "Unknown"),
+        frozenset(data.get("player_names", ())),
+        server
+    )
+
+def save_current_data(state):
+    """Save a MonitorState to its server's data file.
+
+    Nothing is written when the data matches the in-memory copy of the file.
+    Otherwise the write goes through a temporary file so a crash mid-write
+    can't leave a truncated data file behind. Once the background writer is
+    started the write is queued and this returns immediately.
+    """
+    server = state.server or SERVERS[0]
     data_to_save = {
-        "online_count": online_count,
-        "server_status": server_status,
-        "gamemode": gamemode,
+        "online_count": state.online_count,
+        "server_status": state.server_status,
+        "gamemode": state.gamemode,
         "server_type": SERVER_TYPE,
-        "version": version
+        "version": state.version,
+        # Sorted list so the payload is stable across runs
+        "player_names": sorted(state.player_names)
     }
-    # Save player names if provided (convert set to list for JSON serialization)
-    if player_names is not None:
-        data_to_save["player_names"] = list(player_names)
+    # Save the validators of the response this state came from. They're only
+    # written along with a state change, never on their own.
+    if server.etag:
+        data_to_save["etag"] = server.etag
+    if server.last_modified:
+        data_to_save["last_modified"] = server.last_modified
+    
+    saved = _get_state(server.data_file)
+    if saved == data_to_save:
+        return
+    saved.clear()
+    saved.update(data_to_save)
+    payload = orjson.dumps(data_to_save)
     
-    with open(DATA_FILE, "w") as f:
-        json.dump(data_to_save, f)
+    if _writer_thread is None:
+        # No background writer running (e.g. when imported), write inline
+        _write_payload(server.data_file, payload)
+        return
+    _write_queue.put((server.data_file, payload))
+
+def _write_payload(path, payload):
+    """Write a serialized payload to path via a temporary file and an atomic rename."""
+    temp_path = path + ".tmp"
+    # The payload is tiny, so skip the buffered file object and hand it to
+    # the kernel in a single write
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, payload)
+        # Make sure the data is on disk before the rename makes it visible,
+        # otherwise a power loss could leave an empty file in its place
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(temp_path, path)
+
+def _drain_write_queue():
+    """Wait for queued writes and persist them.
+
+    Only the latest state of each file matters, so if the writer has fallen
+    behind, older pending payloads for the same file are skipped.
+    """
+    writes = [_write_queue.get()]
+    while True:
+        try:
+            writes.append(_write_queue.get_nowait())
+        except queue.Empty:
+            break
+    try:
+        # Later payloads for a path replace earlier ones
+        for path, payload in dict(writes).items():
+            try:
+                _write_payload(path, payload)
+            except OSError as e:
+                logger.error("Error saving server data: %s", e)
+    finally:
+        for _ in writes:
+            _write_queue.task_done()
+
+def _writer_loop():
+    """Drain the write queue so disk latency never blocks the next API poll."""
+    while True:
+        _drain_write_queue()
+
+def start_background_writer():
+    """Start the daemon thread that persists server data off the main loop."""
+    global _writer_thread
+    if _writer_thread is not None:
+        return
+    _writer_thread = threading.Thread(target=_writer_loop, name="data-writer", daemon=True)
+    _writer_thread.start()
+    # Let pending writes finish on a normal interpreter exit
+    atexit.register(_write_queue.join)
+
+def next_check_interval(server_status, consecutive_offline, consecutive_no_change, consecutive_failures=0):
+    """Return how many seconds to wait before the next check.
+
+    While the API keeps failing, polling backs off exponentially (capped at
+    MAX_FAILURE_BACKOFF) with +/-20% jitter so monitors that lost the API at
+    the same time don't all retry in lockstep. Otherwise polling backs off
+    exponentially with the number of consecutive checks that found the server
+    offline (capped at MAX_CHECK_INTERVAL) and speeds up for a few checks
+    after something changed, so player activity is caught sooner without
+    polling idle servers more.
+    """
+    if consecutive_failures:
+        backoff = min(CHECK_INTERVAL * 2 ** min(consecutive_failures, 10), max(MAX_FAILURE_BACKOFF, CHECK_INTERVAL))
+        return backoff * random.uniform(0.8, 1.2)
+    if server_status is False:
+        backoff = CHECK_INTERVAL * 2 ** min(max(consecutive_offline - 1, 0), 10)
+        return min(backoff, max(MAX_CHECK_INTERVAL, CHECK_INTERVAL))
+    if consecutive_no_change < ACTIVE_CHECKS:
+        return min(CHECK_INTERVAL, max(CHECK_INTERVAL // 4, MIN_CHECK_INTERVAL))
+    return CHECK_INTERVAL
+
+def _handle_shutdown_signal(signum, frame):
+    """Stop monitoring on SIGTERM (e.g. docker stop) or SIGINT (Ctrl-C).
+
+    Any check in progress is allowed to finish, then the monitor loops
+    return and the interpreter exits normally, so the atexit hooks flush
+    queued data writes, notifications and log lines.
+
+    Nothing is logged here: the handler runs in the main thread, which may
+    be in the middle of putting a log record on the (non-reentrant) log
+    queue. The monitor loops log the shutdown once their wait returns.
+    """
+    global _shutdown_signal
+    _shutdown_signal = signum
+    _shutdown.set()
+
+def _plural(count, word):
+    """Format a count with a naively pluralized word, e.g. "3 plugins"."""
+    return f"{count} {word}{'s' if count != 1 else ''}"
 
 def send_discord_notification(message):
-    """Send a notification to Discord using a webhook."""
+    """Send a notification to Discord using a webhook.
+
+    Once the Discord worker is started the message is queued and this returns
+    immediately, so a slow webhook never delays the next check.
+    """
     if not DISCORD_WEBHOOK_URL:
         log("Discord Webhook URL not set. Skipping notification.")
         return
+    if _discord_thread is None:
+        # No worker running (e.g. when imported), send inline
+        _execute_webhook(message)
+        return
+    _discord_queue.put(message)
+
+def _execute_webhook(message):
+    """POST a single message to the Discord webhook."""
     try:
-        webhook = DiscordWebhook(url=DISCORD_WEBHOOK_URL, content=message)
-        response = webhook.execute()
-        if response.status_code == 200:
+        response = discord_session.post(DISCORD_WEBHOOK_URL, json={"content": message}, timeout=REQUEST_TIMEOUT)
+        # Discord answers 204 No Content unless the webhook is called with ?wait=true
+        if response.status_code in (200, 204):
             log("Notification sent to Discord.")
         else:
-            log(f"Failed to send Discord notification. Status code: {response.status_code}")
+            logger.warning("Failed to send Discord notification. Status code: %s", response.status_code)
     except Exception as e:
-        log(f"Error sending Discord notification: {e}")
+        logger.warning("Error sending Discord notification: %s", e)
 
-def check_server(previous_online_count, previous_server_status, previous_gamemode, previous_version, previous_player_names):
-    """Check the Minecraft server for status, player count, and server info."""
-    
+def _split_message(message, max_length):
+    """Split a message that's longer than max_length at line breaks.
+
+    A single line that's still too long is cut at the length limit.
+    """
+    if len(message) <= max_length:
+        return [message]
+    pieces = []
+    current = ""
+    for line in message.split("\n"):
+        while len(line) > max_length:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(line[:max_length])
+            line = line[max_length:]
+        if current and len(current) + 1 + len(line) <= max_length:
+            current += "\n" + line
+        else:
+            if current:
+                pieces.append(current)
+            current = line
+    if current:
+        pieces.append(current)
+    return pieces
+
+def _coalesce_messages(messages, header=""):
+    """Join queued messages into as few Discord messages as the length limit
+    allows, splitting any message that doesn't fit in one on its own.
+
+    header, if given, starts every resulting Discord message.
+    """
+    max_length = DISCORD_MAX_LENGTH - len(header)
+    batches = []
+    for message in messages:
+        for piece in _split_message(message, max_length):
+            if batches and len(batches[-1]) + 2 + len(piece) <= max_length:
+                batches[-1] += "\n\n" + piece
+            else:
+                batches.append(piece)
+    return [header + batch for batch in batches] if header else batches
+
+def _discord_worker():
+    """Send queued notifications, merging messages that arrive close together."""
+    while True:
+        messages = [_discord_queue.get()]
+        # Give related notifications from the same check a moment to arrive
+        time.sleep(DISCORD_COALESCE_WINDOW)
+        while True:
+            try:
+                messages.append(_discord_queue.get_nowait())
+            except queue.Empty:
+                break
+        for batch in _coalesce_messages(messages):
+            _execute_webhook(batch)
+        for _ in messages:
+            _discord_queue.task_done()
+
+def start_discord_worker():
+    """Start the daemon thread that delivers Discord notifications off the main loop."""
+    global _discord_thread
+    if _discord_thread is not None:
+        return
+    _discord_thread = threading.Thread(target=_discord_worker, name="discord-notifier", daemon=True)
+    _discord_thread.start()
+    # Let pending notifications go out on a normal interpreter exit
+    atexit.register(_discord_queue.join)
+
+def _request_error_label(error):
+    """Describe a request exception by its most specific known base class."""
+    # A read timeout that outlasted the retries comes back from urllib3 as
+    # MaxRetryError, which requests raises as a plain ConnectionError
+    if isinstance(getattr(error.args[0] if error.args else None, "reason", None), ReadTimeoutError):
+        return "timeout"
+    for cls in type(error).__mro__:
+        label = _REQUEST_ERROR_LABELS.get(cls)
+        if label:
+            return label
+    return "request error"
+
+class _ServerStatus(NamedTuple):
+    """The fields of an API response the checks look at.
+
+    The first five line up with the MonitorState fields they're compared to.
+    """
+    online: bool
+    online_count: int
+    version: str
+    gamemode: str
+    player_names: frozenset
+    max_players: int
+    data: dict  # The whole parsed response, read-only
+
+def _extract_bedrock(data):
+    """Pick the fields of a Bedrock API response the checks look at."""
+    players = data.get("players") or _EMPTY_DICT
+    return _ServerStatus(
+        data.get("online", False),
+        players.get("online", 0),
+        data.get("version", "Unknown"),
+        (data.get("gamemode") or "").strip(),
+        _NO_PLAYERS,  # The Bedrock API doesn't provide individual player names
+        players.get("max", 0),
+        data
+    )
+
+def _extract_java(data):
+    """Pick the fields of a Java API response the checks look at."""
+    players = data.get("players") or _EMPTY_DICT
+    return _ServerStatus(
+        data.get("online", False),
+        players.get("online", 0),
+        data.get("version", "Unknown"),
+        "",  # Java servers don't report a gamemode
+        frozenset([player["name"] for player in players.get("list") or ()]),
+        players.get("max", 0),
+        data
+    )
+
+def _fetch_server_data(server, extract):
+    """Query the status API for a server and return extract(parsed response).
+
+    Returns None if the API is unavailable, or if it answered 304 Not Modified
+    to our conditional request, since either way the previous state stands.
+    Within RESPONSE_TTL of the last answer that answer is returned again
+    without querying the API.
+    """
+    if server.answered_at is not None and time.monotonic() - server.answered_at < RESPONSE_TTL:
+        return server.last_response[1] if server.last_response is not None else None
+    server.consecutive_failures += 1  # Reset below once the API has answered
     try:
-        # Add User-Agent header as required by the API
-        headers = {
-            "User-Agent": "MC-Server-Discord-Monitor (https://github.com/Philipovic/mc-bedrock-monitor)"
-        }
-        response = session.get(API_URL, headers=headers, timeout=REQUEST_TIMEOUT)
+        headers = {}
+        if server.etag:
+            headers["If-None-Match"] = server.etag
+        if server.last_modified:
+            headers["If-Modified-Since"] = server.last_modified
+        response = session.get(server.api_url, headers=headers or None, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
-        data = response.json()
+        if response.status_code == 304:
+            server.consecutive_failures = 0
+            server.answered_at = time.monotonic()
+            return None
+        body = response.content
+        body_digest = hashlib.blake2b(body, digest_size=16).digest()
+        if server.last_response is not None and server.last_response[0] == body_digest:
+            # Same body as last time, reuse what was extracted from it
+            data = server.last_response[1]
+        else:
+            # Drop the base64 server icon before parsing: it's by far the
+            # largest field in the response and we never use it
+            data = extract(orjson.loads(_ICON_FIELD_RE.sub(b"", body, count=1)))
+            server.last_response = (body_digest, data)
+        server.etag = response.headers.get("ETag")
+        server.last_modified = response.headers.get("Last-Modified")
+        server.consecutive_failures = 0
+        server.answered_at = time.monotonic()
+        return data
         
-    except requests.exceptions.ConnectionError as e:
-        # Network is down, DNS failure, or API server unreachable
-        log(f"API unreachable (connection error): {e}")
-        return previous_online_count, previous_server_status, previous_gamemode, previous_version, previous_player_names
-    except requests.exceptions.Timeout as e:
-        # Request timed out
-        log(f"API unreachable (timeout): {e}")
-        return previous_online_count, previous_server_status, previous_gamemode, previous_version, previous_player_names
     except requests.exceptions.HTTPError as e:
         # Server returned an error status code
         status_code = e.response.status_code if e.response is not None else "unknown"
-        log(f"API error (HTTP {status_code}): {e}")
-        return previous_online_count, previous_server_status, previous_gamemode, previous_version, previous_player_names
+        logger.warning("API error (HTTP %s): %s", status_code, e)
     except requests.exceptions.RequestException as e:
-        # Any other request-related error
-        log(f"API unreachable (request error): {e}")
-        return previous_online_count, previous_server_status, previous_gamemode, previous_version, previous_player_names
-    except json.JSONDecodeError as e:
+        # Network is down, DNS failure, timeout or any other request-related error
+        logger.warning("API unreachable (%s): %s", _request_error_label(e), e)
+    except orjson.JSONDecodeError as e:
         # Invalid JSON response from API
-        log(f"API returned invalid JSON: {e}")
-        return previous_online_count, previous_server_status, previous_gamemode, previous_version, previous_player_names
-    
-    server_online = data.get("online", False)
-    online_count = data.get("players", {}).get("online", 0)
-    max_players = data.get("players", {}).get("max", 0)
-    current_version = data.get("version", "Unknown")
-    
-    # Initialize variables that may be used later
-    motd = ""
-    gamemode = ""
-    current_player_names = set()
-    
-    # Handle server-type specific information
-    if SERVER_TYPE == "BEDROCK":
-        gamemode = data.get("gamemode", "").strip()
-        server_info = f"Version: {current_version}"
-        # Bedrock API doesn't provide individual player names
-    else:  # JAVA
-        # Java servers don't report gamemode, but do have MOTD
-        software = data.get("software", "")
-        motd = data.get("motd", {}).get("clean", [""])[0] if data.get("motd") else ""
-        plugins = data.get("plugins", [])
-        mods = data.get("mods", [])
-        
-        # Get current player names for Java servers
-        if "list" in data.get("players", {}):
-            player_list = data["players"]["list"]
-            current_player_names = set(player["name"] for player in player_list)
-        
-        # Build server info string using list for efficient concatenation
-        info_parts = [f"Version: {current_version}"]
-        if software:
-            info_parts.append(f"({software})")
-        if plugins:
-            plugin_count = len(plugins)
-            info_parts.append(f"{plugin_count} plugin{'s' if plugin_count != 1 else ''}")
-        if mods:
-            mod_count = len(mods)
-            info_parts.append(f"{mod_count} mod{'s' if mod_count != 1 else ''}")
-        
-        server_info = " | ".join(info_parts)
+        logger.warning("API returned invalid JSON: %s", e)
+    return None
 
-    # Track if we need to save data
-    data_changed = False
-    
+# Notification texts, bound once here and only formatted when something changed
+_ONLINE_MESSAGE = "✅ The server is now ONLINE!{}".format
+_OFFLINE_MESSAGE = "❌ The server is now OFFLINE."
+_VERSION_CHANGED_MESSAGE = "🔄 Server version changed: {} → {}".format
+_GAMEMODE_CHANGED_MESSAGE = "ℹ️ Gamemode changed to: {}".format
+_PLAYER_COUNT_MESSAGE = "📊 {}/{} players online".format
+# Per-player message formatters for Java join/leave notifications
+_JOINED_MESSAGE = "🎮 {} joined!".format
+_LEFT_MESSAGE = "👋 {} left.".format
+# Join/leave messages for when only the player count is known
+_ONE_JOINED_MESSAGE = "🎮 A player joined!"
+_MANY_JOINED_MESSAGE = "🎮 {} players joined!".format
+_ONE_LEFT_MESSAGE = "👋 A player left."
+_MANY_LEFT_MESSAGE = "👋 {} players left.".format
+
+def _notify(messages, message):
+    """Log a message and add it to the notifications sent at the end of the check."""
+    log(message)
+    messages.append(message)
+
+def _send_notifications(messages, server):
+    """Send a check's notifications to Discord in as few messages as possible."""
+    # Several servers post to the same channel, say which one this is about
+    # once at the top of each Discord message
+    header = f"**{server.address}**\n" if len(SERVERS) > 1 else ""
+    for batch in _coalesce_messages(messages, header):
+        send_discord_notification(batch)
+
+def _notify_status_change(messages, server_online, previous_server_status, current_version, previous_version,
+                          describe=None):
+    """Announce ONLINE/OFFLINE transitions and version changes.
+
+    describe, if given, is called to get extra lines for the ONLINE message,
+    so they're only built when the server actually came online. Returns True
+    if anything was announced.
+    """
     # Notify if the server status changes or it's the first check
     if server_online != previous_server_status or previous_server_status is None:
-        data_changed = True
         if server_online:
             # Format version in parentheses on the same line as ONLINE message
             version_str = f" ({current_version})" if current_version and current_version != "Unknown" else ""
-            message_parts = [f"✅ The server is now ONLINE!{version_str}"]
-            # Add additional server info (software, plugins, mods) for Java servers
-            if SERVER_TYPE == "JAVA":
-                extra_info = []
-                software = data.get("software", "")
-                plugins = data.get("plugins", [])
-                mods = data.get("mods", [])
-                if software:
-                    extra_info.append(software)
-                if plugins:
-                    plugin_count = len(plugins)
-                    extra_info.append(f"{plugin_count} plugin{'s' if plugin_count != 1 else ''}")
-                if mods:
-                    mod_count = len(mods)
-                    extra_info.append(f"{mod_count} mod{'s' if mod_count != 1 else ''}")
-                if extra_info:
-                    message_parts.append(" | ".join(extra_info))
-            if motd:
-                message_parts.append(f"📝 {motd}")
-            message = "\n".join(message_parts)
-            log(message)
-            send_discord_notification(message)
+            _notify(messages, "\n".join([_ONLINE_MESSAGE(version_str), *(describe() if describe else ())]))
         else:
-            message = "❌ The server is now OFFLINE."
-            log(message)
-            send_discord_notification(message)
+            _notify(messages, _OFFLINE_MESSAGE)
+        return True
     
     # Notify if server version changes while online
-    elif server_online and current_version != previous_version and current_version != "Unknown":
-        data_changed = True
-        message = f"🔄 Server version changed: {previous_version} → {current_version}"
-        log(message)
-        send_discord_notification(message)
-
-    # Notify if the gamemode changes (only for Bedrock servers and when server is online)
-    if SERVER_TYPE == "BEDROCK" and server_online and gamemode != previous_gamemode:
-        data_changed = True
-        message = f"ℹ️ Gamemode changed to: {gamemode}"
-        log(message)
-        send_discord_notification(message)
+    if server_online and current_version != previous_version and current_version != "Unknown":
+        _notify(messages, _VERSION_CHANGED_MESSAGE(previous_version, current_version))
+        return True
+    return False
 
+def _notify_player_count_change(messages, online_count, previous_online_count, max_players):
+    """Announce how many players joined or left, for when player names aren't available."""
+    player_diff = online_count - previous_online_count
+    
+    if player_diff > 0:
+        change = _ONE_JOINED_MESSAGE if player_diff == 1 else _MANY_JOINED_MESSAGE(player_diff)
+    else:  # player_diff < 0
+        change = _ONE_LEFT_MESSAGE if player_diff == -1 else _MANY_LEFT_MESSAGE(-player_diff)
+    
+    _notify(messages, f"{change}\n{_PLAYER_COUNT_MESSAGE(online_count, max_players)}")
+
+def _finish_check(state, server, messages, data_changed, server_online, online_count, gamemode, current_version,
+                  current_player_names):
+    """Send the check's notifications, update the state and persist it if it changed.
+
+    Returns data_changed, as check_server does.
+    """
+    # One Discord post per check rather than one per event
+    _send_notifications(messages, server)
+    
+    state.online_count = online_count
+    state.server_status = server_online
+    if server_online:  # Keep the last known gamemode and version while the server is offline
+        state.gamemode = gamemode
+        state.version = current_version
+        state.player_names = current_player_names
+    else:
+        state.player_names = _NO_PLAYERS
+    
+    # Save the updated server status, player count, gamemode, version and player names only if data changed
+    if data_changed:
+        save_current_data(state)
+    return data_changed
+
+def _check_bedrock(state):
+    """check_server implementation for Bedrock servers."""
+    server = state.server or SERVERS[0]
+    status = _fetch_server_data(server, _extract_bedrock)
+    if status is None:
+        return False
+    
+    # Nothing changed since the last check (the common case): skip all the
+    # notification logic
+    if status[:5] == (state.server_status, state.online_count, state.version, state.gamemode, state.player_names):
+        return False
+    server_online, online_count, current_version, gamemode, _, max_players, _ = status
+    
+    messages = []
+    data_changed = _notify_status_change(messages, server_online, state.server_status, current_version, state.version)
+    
+    if server_online:
+        # Notify if the gamemode changes
+        if gamemode != state.gamemode:
+            data_changed = True
+            _notify(messages, _GAMEMODE_CHANGED_MESSAGE(gamemode))
+        
+        # Bedrock API doesn't provide individual player names, so use the count
+        if online_count != state.online_count:
+            data_changed = True
+            _notify_player_count_change(messages, online_count, state.online_count, max_players)
+    
+    return _finish_check(state, server, messages, data_changed, server_online, online_count, gamemode, current_version,
+                         _NO_PLAYERS)
+
+def _java_details(data):
+    """Return the extra ONLINE message lines for a Java server: a summary of
+    its software, plugins and mods, and its MOTD."""
+    # Java servers don't report gamemode, but do have MOTD
+    software = data.get("software", "")
+    motd = ((data.get("motd") or _EMPTY_DICT).get("clean") or ("",))[0]
+    plugins = data.get("plugins", ())
+    mods = data.get("mods", ())
+    
+    details = []
+    summary = " | ".join(filter(None, (
+        software,
+        _plural(len(plugins), "plugin") if plugins else "",
+        _plural(len(mods), "mod") if mods else "",
+    )))
+    if summary:
+        details.append(summary)
+    if motd:
+        details.append(f"📝 {motd}")
+    return details
+
+def _check_java(state):
+    """check_server implementation for Java servers."""
+    server = state.server or SERVERS[0]
+    status = _fetch_server_data(server, _extract_java)
+    if status is None:
+        return False
+    
+    # Nothing changed since the last check (the common case): skip all the
+    # notification logic
+    if status[:5] == (state.server_status, state.online_count, state.version, state.gamemode, state.player_names):
+        return False
+    server_online, online_count, current_version, _, current_player_names, max_players, data = status
+    
+    messages = []
+    data_changed = _notify_status_change(messages, server_online, state.server_status, current_version, state.version,
+                                         lambda: _java_details(data))
+    
     # Handle player join/leave events
     if server_online:
-        if SERVER_TYPE == "JAVA" and (current_player_names or previous_player_names):
-            # For Java servers, we can track individual players
-            joined_players = current_player_names - previous_player_names
-            left_players = previous_player_names - current_player_names
+        previous_player_names = state.player_names
+        if current_player_names or previous_player_names:
+            # We can track individual players. Collect the differences
+            # straight into lists and sort them in place for consistent
+            # ordering, rather than building two temporary sets.
+            joined_players = [name for name in current_player_names if name not in previous_player_names]
+            left_players = [name for name in previous_player_names if name not in current_player_names]
+            joined_players.sort()
+            left_players.sort()
             
-            # Build message parts for joins and leaves
-            message_parts = []
-            
-            # Add join notifications
-            if joined_players:
-                data_changed = True
-                for player_name in sorted(joined_players):  # Sort for consistent ordering
-                    message_parts.append(f"🎮 {player_name} joined!")
-            
-            # Add leave notifications
-            if left_players:
+            # Build one message listing joins, then leaves, then the player count
+            if joined_players or left_players:
                 data_changed = True
-                for player_name in sorted(left_players):  # Sort for consistent ordering
-                    message_parts.append(f"👋 {player_name} left.")
-            
-            # Add player count once at the end if there were any changes
-            if message_parts:
-                message_parts.append(f"📊 {online_count}/{max_players} players online")
-                message = "\n".join(message_parts)
-                log(message)
-                send_discord_notification(message)
-                
-        elif online_count != previous_online_count:
-            # For Bedrock servers or when player names aren't available, fall back to count-based detection
+                _notify(messages, "\n".join([
+                    *map(_JOINED_MESSAGE, joined_players),
+                    *map(_LEFT_MESSAGE, left_players),
+                    _PLAYER_COUNT_MESSAGE(online_count, max_players)
+                ]))
+        
+        elif online_count != state.online_count:
+            # Player names aren't available, fall back to count-based detection
             data_changed = True
-            player_diff = online_count - previous_online_count
-            
-            if player_diff > 0:
-                if player_diff == 1:
-                    message = f"🎮 A player joined!\n📊 {online_count}/{max_players} players online"
-                else:
-                    message = f"🎮 {player_diff} players joined!\n📊 {online_count}/{max_players} players online"
-            else:  # player_diff < 0
-                player_diff = abs(player_diff)
-                if player_diff == 1:
-                    message = f"👋 A player left.\n📊 {online_count}/{max_players} players online"
-                else:
-                    message = f"👋 {player_diff} players left.\n📊 {online_count}/{max_players} players online"
-            
-            log(message)
-            send_discord_notification(message)
+            _notify_player_count_change(messages, online_count, state.online_count, max_players)
+    
+    return _finish_check(state, server, messages, data_changed, server_online, online_count, "", current_version,
+                         current_player_names)
 
-    # Save the updated server status, player count, gamemode, version and player names only if data changed
-    if data_changed:
-        if server_online:  # Save gamemode, current version and player names only if the server is online
-            save_current_data(online_count, server_online, gamemode, current_version, current_player_names)
-        else:
-            save_current_data(online_count, server_online, previous_gamemode, previous_version, set())
-
-    return (
-        online_count,
-        server_online,
-        gamemode if server_online else previous_gamemode,
-        current_version if server_online else previous_version,
-        current_player_names if server_online else set()
-    )
+# SERVER_TYPE never changes at runtime, so pick the matching implementation
+# once instead of branching on it every check. check_server(state) updates the
+# MonitorState in place and returns True if anything changed.
+check_server = _check_bedrock if SERVER_TYPE == "BEDROCK" else _check_java
+
+def monitor_loop(server):
+    """Check a server until shutdown, waiting the adaptive interval between checks."""
+    # Load the last known server and player data
+    state = load_previous_data(server)
+    
+    consecutive_offline = 0
+    consecutive_no_change = ACTIVE_CHECKS  # Start at the regular interval
+    # Checks are scheduled against a monotonic deadline, so neither the time
+    # spent waiting on the API nor oversleeping a wait adds up to drift
+    deadline = time.monotonic()
+    while True:
+        data_changed = check_server(state)
+        consecutive_offline = consecutive_offline + 1 if state.server_status is False else 0
+        consecutive_no_change = 0 if data_changed else consecutive_no_change + 1
+        deadline += next_check_interval(state.server_status, consecutive_offline, consecutive_no_change,
+                                        server.consecutive_failures)
+        now = time.monotonic()
+        if deadline < now:
+            # Fell behind (e.g. a check slower than the interval): check now
+            # and schedule from here instead of catching up back-to-back
+            deadline = now
+        if _shutdown.wait(deadline - now):
+            if _shutdown_signal is not None:
+                log(f"Received {signal.Signals(_shutdown_signal).name}, shutting down...")
+            break
 
 if __name__ == "__main__":
+    if len(SERVERS) > 1:
+        # Each server is checked in a thread named after it, tag log lines with it
+        _log_handler.setFormatter(_TimestampFormatter("[%(asctime)s] [%(threadName)s] %(message)s"))
+    start_log_listener()
+    
     log(f"Starting Minecraft {SERVER_TYPE} Server Monitor...")
-    log(f"Monitoring server: {MC_SERVER}")
+    log(f"Monitoring server{'s' if len(SERVERS) > 1 else ''}: {', '.join(MC_SERVERS)}")
     log(f"Check interval: {CHECK_INTERVAL} seconds")
     
-    # Load the last known server and player data
-    previous_online_count, previous_server_status, previous_gamemode, stored_server_type, previous_version, previous_player_names = load_previous_data()
+    # Create data directory once at startup rather than on every save
+    os.makedirs(DATA_DIR, exist_ok=True)
+    start_background_writer()
+    start_discord_worker()
+    # SIGINT too, so Ctrl-C also stops the monitor threads (which aren't daemons)
+    # instead of only interrupting the main thread
+    signal.signal(signal.SIGTERM, _handle_shutdown_signal)
+    signal.signal(signal.SIGINT, _handle_shutdown_signal)
     
-    # Warn if server type has changed since last run
-    if stored_server_type and stored_server_type != SERVER_TYPE:
-        log(f"Warning: Server type has changed from {stored_server_type} to {SERVER_TYPE}")
-
-    while True:
-        previous_online_count, previous_server_status, previous_gamemode, previous_version, previous_player_names = check_server(
-            previous_online_count, previous_server_status, previous_gamemode, previous_version, previous_player_names
-        )
-        time.sleep(CHECK_INTERVAL)
+    if len(SERVERS) == 1:
+        monitor_loop(SERVERS[0])
+    else:
+        # One thread per server rather than one process each: they share the
+        # interpreter, the API connection pool and the writer and Discord
+        # workers
+        monitor_failed = threading.Event()
+        
+        def run_monitor(server):
+            try:
+                monitor_loop(server)
+            except Exception:
+                # Stop the other monitors too and exit (letting the container
+                # restart) rather than silently keep running without this one
+                monitor_failed.set()
+                _shutdown.set()
+                raise
+        
+        monitors = [
+            threading.Thread(target=run_monitor, args=(server,), name=server.address)
+            for server in SERVERS
+        ]
+        for monitor in monitors:
+            monitor.start()
+        for monitor in monitors:
+            monitor.join()
+        if monitor_failed.is_set():
+            sys.exit(1)
+    
+    # No more API requests from here on; pending writes and notifications
+    # are flushed by the atexit hooks
+    session.close()
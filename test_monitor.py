@@ -1,17 +1,61 @@
 import unittest
 from unittest.mock import patch, Mock, MagicMock
 import requests
+from urllib3.exceptions import MaxRetryError, ReadTimeoutError
 import json
 import os
 import tempfile
 import sys
 import re
 from io import StringIO
+from contextlib import redirect_stdout
 
 # Import the monitor module
 import monitor
 
 
+# Timestamp prefix added to every stdout log line
+TIMESTAMP_RE = re.compile(r'\[\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\]')
+
+
+def setUpModule():
+    """Disable reuse of recent API answers, the tests run checks back-to-back."""
+    response_ttl_patcher = patch.object(monitor, 'RESPONSE_TTL', 0)
+    response_ttl_patcher.start()
+    unittest.addModuleCleanup(response_ttl_patcher.stop)
+
+
+def make_ok_response(payload, headers=None):
+    """Build a mock 200 API response whose body is payload encoded as JSON."""
+    mock_response = Mock()
+    mock_response.status_code = 200
+    mock_response.raise_for_status.return_value = None
+    mock_response.headers = headers if headers is not None else {}
+    mock_response.content = json.dumps(payload).encode()
+    return mock_response
+
+
+def make_error_response(status_code):
+    """Build a mock API response that failed with the given HTTP status."""
+    mock_response = Mock()
+    mock_response.status_code = status_code
+    mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError(response=mock_response)
+    return mock_response
+
+
+def reset_server_state(test_case):
+    """Start test_case from a server the API hasn't answered yet.
+
+    Checks record the API's answer on monitor.SERVERS[0]; patching those
+    fields for each test keeps tests from seeing each other's responses.
+    """
+    for field, value in (("etag", None), ("last_modified", None), ("last_response", None),
+                         ("consecutive_failures", 0), ("answered_at", None)):
+        patcher = patch.object(monitor.SERVERS[0], field, value)
+        patcher.start()
+        test_case.addCleanup(patcher.stop)
+
+
 class TestTimestampLogging(unittest.TestCase):
     """Test that timestamps are added to stdout logging but not to Discord notifications."""
     
@@ -19,58 +63,64 @@ class TestTimestampLogging(unittest.TestCase):
         """Set up test fixtures."""
         # Create a temporary file for data storage
         self.temp_fd, self.temp_path = tempfile.mkstemp(suffix='.json')
+        self.addCleanup(os.unlink, self.temp_path)
+        self.addCleanup(os.close, self.temp_fd)
         
-        # Patch the DATA_FILE path
-        self.data_file_patcher = patch.object(monitor, 'DATA_FILE', self.temp_path)
-        self.data_file_patcher.start()
+        # Patch the data file path
+        data_file_patcher = patch.object(monitor.SERVERS[0], 'data_file', self.temp_path)
+        data_file_patcher.start()
+        self.addCleanup(data_file_patcher.stop)
+        reset_server_state(self)
         
         # Mock Discord webhook to prevent actual notifications
-        self.discord_patcher = patch('monitor.send_discord_notification')
-        self.mock_discord = self.discord_patcher.start()
+        discord_patcher = patch('monitor.send_discord_notification')
+        self.mock_discord = discord_patcher.start()
+        self.addCleanup(discord_patcher.stop)
         
-    def tearDown(self):
-        """Clean up test fixtures."""
-        self.discord_patcher.stop()
-        self.data_file_patcher.stop()
-        os.close(self.temp_fd)
-        os.unlink(self.temp_path)
-    
     def test_log_function_adds_timestamp(self):
         """Test that the log function adds a timestamp to messages."""
         # Capture stdout
-        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+        with redirect_stdout(StringIO()) as stdout:
             monitor.log("Test message")
-            output = mock_stdout.getvalue()
+            output = stdout.getvalue()
             
             # Check that output has timestamp format [YYYY-MM-DD HH:MM:SS]
-            timestamp_pattern = r'^\[\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\] Test message\n$'
-            self.assertRegex(output, timestamp_pattern)
+            self.assertRegex(output, rf'^{TIMESTAMP_RE.pattern} Test message\n$')
+    
+    def test_log_timestamp_reused_within_same_second(self):
+        """Test that the timestamp is formatted once for log lines in the same second."""
+        formatter = monitor._TimestampFormatter()
+        records = [
+            monitor.logging.makeLogRecord({"msg": msg, "created": 1700000000.5})
+            for msg in ("First", "Second")
+        ]
+        with patch('monitor.time.strftime', wraps=monitor.time.strftime) as mock_strftime:
+            lines = [formatter.format(record) for record in records]
+        
+        self.assertEqual(mock_strftime.call_count, 1)
+        self.assertEqual(lines[0][:21], lines[1][:21])
+        self.assertRegex(lines[1], rf'^{TIMESTAMP_RE.pattern} Second$')
     
     @patch('monitor.session')
     def test_server_status_log_has_timestamp(self, mock_session):
         """Test that server status messages to stdout have timestamps."""
         # Mock successful API response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.raise_for_status.return_value = None
-        mock_response.json.return_value = {
+        mock_session.get.return_value = make_ok_response({
             "online": True,
             "players": {"online": 2, "max": 10},
             "version": "1.21.0",
             "gamemode": "Survival"
-        }
-        mock_session.get.return_value = mock_response
+        })
         
         # Capture stdout
-        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+        with redirect_stdout(StringIO()) as stdout:
             # Call check_server with None status (first check)
-            monitor.check_server(0, None, "", "Unknown", set())
+            monitor.check_server(monitor.MonitorState())
             
-            output = mock_stdout.getvalue()
+            output = stdout.getvalue()
             
             # Check that output has timestamp format
-            timestamp_pattern = r'\[\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\]'
-            self.assertRegex(output, timestamp_pattern)
+            self.assertRegex(output, TIMESTAMP_RE)
             
             # Check that the actual message is in the output
             self.assertIn("The server is now ONLINE!", output)
@@ -79,33 +129,28 @@ class TestTimestampLogging(unittest.TestCase):
     def test_discord_notification_no_timestamp(self, mock_session):
         """Test that Discord notifications don't include timestamps."""
         # Mock successful API response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.raise_for_status.return_value = None
-        mock_response.json.return_value = {
+        mock_session.get.return_value = make_ok_response({
             "online": True,
             "players": {"online": 2, "max": 10},
             "version": "1.21.0",
             "gamemode": "Survival"
-        }
-        mock_session.get.return_value = mock_response
+        })
         
         # Reset the discord mock to actually capture the message
         self.mock_discord.reset_mock()
         
         # Call check_server with None status (first check)
-        monitor.check_server(0, None, "", "Unknown", set())
+        monitor.check_server(monitor.MonitorState())
         
-        # Verify Discord notification was called at least once
-        self.assertTrue(self.mock_discord.called)
+        # Verify the check's notifications went out as a single Discord message
+        self.mock_discord.assert_called_once()
         
         # Check all Discord messages don't contain timestamps
-        timestamp_pattern = r'\[\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\]'
         for call_args in self.mock_discord.call_args_list:
             discord_message = call_args[0][0]
             
             # Check that the Discord message does NOT contain a timestamp
-            self.assertNotRegex(discord_message, timestamp_pattern,
+            self.assertNotRegex(discord_message, TIMESTAMP_RE,
                                f"Discord message should not contain timestamp: {discord_message}")
             
             # Check that the message is not empty
@@ -118,19 +163,38 @@ class TestTimestampLogging(unittest.TestCase):
         mock_session.get.side_effect = requests.exceptions.ConnectionError("Network unreachable")
         
         # Capture stdout
-        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
-            monitor.check_server(5, True, "Survival", "1.21.0", set())
+        with redirect_stdout(StringIO()) as stdout:
+            monitor.check_server(monitor.MonitorState(5, True, "Survival", "1.21.0"))
             
-            output = mock_stdout.getvalue()
+            output = stdout.getvalue()
             
             # Check that output has timestamp format
-            timestamp_pattern = r'\[\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\]'
-            self.assertRegex(output, timestamp_pattern)
+            self.assertRegex(output, TIMESTAMP_RE)
             
             # Check that the actual error message is in the output
             self.assertIn("API unreachable (connection error)", output)
+    
+    @patch('monitor.session')
+    def test_warning_level_keeps_only_problems(self, mock_session):
+        """Test that LOG_LEVEL=WARNING drops routine lines but keeps API failures."""
+        self.addCleanup(monitor.logger.setLevel, monitor.logger.level)
+        monitor.logger.setLevel(monitor.logging.WARNING)
+        mock_session.get.side_effect = [
+            make_ok_response({"online": True, "players": {"online": 0, "max": 10}, "version": "1.21.0"}),
+            requests.exceptions.ConnectionError("Network unreachable"),
+        ]
+        
+        state = monitor.MonitorState()
+        with redirect_stdout(StringIO()) as stdout:
+            monitor.check_server(state)
+            monitor.check_server(state)
+        
+        self.assertTrue(state.server_status)
+        self.assertNotIn("ONLINE", stdout.getvalue())
+        self.assertIn("API unreachable (connection error): Network unreachable", stdout.getvalue())
 
 
+@patch.object(monitor.logger, 'disabled', True)
 class TestAPIFailureHandling(unittest.TestCase):
     """Test that API failures don't trigger state changes or notifications."""
     
@@ -138,160 +202,63 @@ class TestAPIFailureHandling(unittest.TestCase):
         """Set up test fixtures."""
         # Create a temporary file for data storage
         self.temp_fd, self.temp_path = tempfile.mkstemp(suffix='.json')
+        self.addCleanup(os.unlink, self.temp_path)
+        self.addCleanup(os.close, self.temp_fd)
         
-        # Patch the DATA_FILE path
-        self.data_file_patcher = patch.object(monitor, 'DATA_FILE', self.temp_path)
-        self.data_file_patcher.start()
+        # Patch the data file path
+        data_file_patcher = patch.object(monitor.SERVERS[0], 'data_file', self.temp_path)
+        data_file_patcher.start()
+        self.addCleanup(data_file_patcher.stop)
+        reset_server_state(self)
         
         # Mock Discord webhook to prevent actual notifications
-        self.discord_patcher = patch('monitor.send_discord_notification')
-        self.mock_discord = self.discord_patcher.start()
+        discord_patcher = patch('monitor.send_discord_notification')
+        self.mock_discord = discord_patcher.start()
+        self.addCleanup(discord_patcher.stop)
         
         # Initial state
         self.initial_online_count = 5
         self.initial_server_status = True
         self.initial_gamemode = "Survival"
         self.initial_version = "1.21.0"
-        self.initial_player_names = {"player1", "player2"}
-        
-    def tearDown(self):
-        """Clean up test fixtures."""
-        self.discord_patcher.stop()
-        self.data_file_patcher.stop()
-        os.close(self.temp_fd)
-        os.unlink(self.temp_path)
-    
-    @patch('monitor.session')
-    def test_connection_error_preserves_state(self, mock_session):
-        """Test that ConnectionError preserves previous state."""
-        # Simulate a connection error
-        mock_session.get.side_effect = requests.exceptions.ConnectionError("Network unreachable")
-        
-        # Call check_server with initial state
-        result = monitor.check_server(
-            self.initial_online_count,
-            self.initial_server_status,
-            self.initial_gamemode,
-            self.initial_version,
-            self.initial_player_names
-        )
-        
-        # Verify state is unchanged
-        self.assertEqual(result[0], self.initial_online_count)
-        self.assertEqual(result[1], self.initial_server_status)
-        self.assertEqual(result[2], self.initial_gamemode)
-        self.assertEqual(result[3], self.initial_version)
-        self.assertEqual(result[4], self.initial_player_names)
-        
-        # Verify no Discord notification was sent
-        self.mock_discord.assert_not_called()
-    
-    @patch('monitor.session')
-    def test_timeout_preserves_state(self, mock_session):
-        """Test that Timeout error preserves previous state."""
-        # Simulate a timeout
-        mock_session.get.side_effect = requests.exceptions.Timeout("Request timed out")
-        
-        # Call check_server with initial state
-        result = monitor.check_server(
-            self.initial_online_count,
-            self.initial_server_status,
-            self.initial_gamemode,
-            self.initial_version,
-            self.initial_player_names
-        )
-        
-        # Verify state is unchanged
-        self.assertEqual(result[0], self.initial_online_count)
-        self.assertEqual(result[1], self.initial_server_status)
-        self.assertEqual(result[2], self.initial_gamemode)
-        self.assertEqual(result[3], self.initial_version)
-        self.assertEqual(result[4], self.initial_player_names)
-        
-        # Verify no Discord notification was sent
-        self.mock_discord.assert_not_called()
-    
-    @patch('monitor.session')
-    def test_http_error_preserves_state(self, mock_session):
-        """Test that HTTP error (500) preserves previous state."""
-        # Create a mock response with 500 status code
-        mock_response = Mock()
-        mock_response.status_code = 500
-        mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError(response=mock_response)
-        mock_session.get.return_value = mock_response
-        
-        # Call check_server with initial state
-        result = monitor.check_server(
-            self.initial_online_count,
-            self.initial_server_status,
-            self.initial_gamemode,
-            self.initial_version,
-            self.initial_player_names
-        )
+        self.initial_player_names = frozenset({"player1", "player2"})
         
-        # Verify state is unchanged
-        self.assertEqual(result[0], self.initial_online_count)
-        self.assertEqual(result[1], self.initial_server_status)
-        self.assertEqual(result[2], self.initial_gamemode)
-        self.assertEqual(result[3], self.initial_version)
-        self.assertEqual(result[4], self.initial_player_names)
-        
-        # Verify no Discord notification was sent
-        self.mock_discord.assert_not_called()
-    
-    @patch('monitor.session')
-    def test_request_exception_preserves_state(self, mock_session):
-        """Test that generic RequestException preserves previous state."""
-        # Simulate a generic request exception
-        mock_session.get.side_effect = requests.exceptions.RequestException("Unknown error")
-        
-        # Call check_server with initial state
-        result = monitor.check_server(
+    def make_initial_state(self):
+        """Build a fresh MonitorState holding the initial state."""
+        return monitor.MonitorState(
             self.initial_online_count,
             self.initial_server_status,
             self.initial_gamemode,
             self.initial_version,
             self.initial_player_names
         )
-        
-        # Verify state is unchanged
-        self.assertEqual(result[0], self.initial_online_count)
-        self.assertEqual(result[1], self.initial_server_status)
-        self.assertEqual(result[2], self.initial_gamemode)
-        self.assertEqual(result[3], self.initial_version)
-        self.assertEqual(result[4], self.initial_player_names)
-        
-        # Verify no Discord notification was sent
-        self.mock_discord.assert_not_called()
     
-    @patch('monitor.session')
-    def test_json_decode_error_preserves_state(self, mock_session):
-        """Test that JSON decode error preserves previous state."""
-        # Create a mock response with invalid JSON
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.raise_for_status.return_value = None
-        mock_response.json.side_effect = json.JSONDecodeError("Invalid JSON", "", 0)
-        mock_session.get.return_value = mock_response
-        
-        # Call check_server with initial state
-        result = monitor.check_server(
-            self.initial_online_count,
-            self.initial_server_status,
-            self.initial_gamemode,
-            self.initial_version,
-            self.initial_player_names
-        )
-        
-        # Verify state is unchanged
-        self.assertEqual(result[0], self.initial_online_count)
-        self.assertEqual(result[1], self.initial_server_status)
-        self.assertEqual(result[2], self.initial_gamemode)
-        self.assertEqual(result[3], self.initial_version)
-        self.assertEqual(result[4], self.initial_player_names)
-        
-        # Verify no Discord notification was sent
-        self.mock_discord.assert_not_called()
+    def test_api_failure_preserves_state(self):
+        """Test that each kind of API failure preserves previous state."""
+        invalid_json = make_ok_response(None)
+        invalid_json.content = b"<html>Bad Gateway</html>"
+        failures = [
+            ("connection error", requests.exceptions.ConnectionError("Network unreachable")),
+            ("timeout", requests.exceptions.Timeout("Request timed out")),
+            ("HTTP 500", make_error_response(500)),
+            ("request error", requests.exceptions.RequestException("Unknown error")),
+            ("invalid JSON", invalid_json),
+        ]
+        for name, failure in failures:
+            with self.subTest(name), patch('monitor.session') as mock_session:
+                # Exceptions are raised by session.get, responses are returned
+                mock_session.get.side_effect = [failure]
+                
+                # Call check_server with initial state
+                state = self.make_initial_state()
+                changed = monitor.check_server(state)
+                
+                # Verify state is unchanged
+                self.assertFalse(changed)
+                self.assertEqual(state, self.make_initial_state())
+                
+                # Verify no Discord notification was sent
+                self.mock_discord.assert_not_called()
     
     @patch('monitor.session')
     def test_multiple_api_failures_preserve_state(self, mock_session):
@@ -299,39 +266,22 @@ class TestAPIFailureHandling(unittest.TestCase):
         # First call - connection error
         mock_session.get.side_effect = requests.exceptions.ConnectionError("Network unreachable")
         
-        result1 = monitor.check_server(
-            self.initial_online_count,
-            self.initial_server_status,
-            self.initial_gamemode,
-            self.initial_version,
-            self.initial_player_names
-        )
+        state = self.make_initial_state()
+        monitor.check_server(state)
         
         # Second call - timeout
         mock_session.get.side_effect = requests.exceptions.Timeout("Timeout")
         
-        result2 = monitor.check_server(
-            result1[0], result1[1], result1[2], result1[3], result1[4]
-        )
+        monitor.check_server(state)
         
         # Third call - HTTP error
-        mock_response = Mock()
-        mock_response.status_code = 503
-        mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError(response=mock_response)
         mock_session.get.side_effect = None
-        mock_session.get.return_value = mock_response
+        mock_session.get.return_value = make_error_response(503)
         
-        result3 = monitor.check_server(
-            result2[0], result2[1], result2[2], result2[3], result2[4]
-        )
+        monitor.check_server(state)
         
-        # All results should maintain the initial state
-        for result in [result1, result2, result3]:
-            self.assertEqual(result[0], self.initial_online_count)
-            self.assertEqual(result[1], self.initial_server_status)
-            self.assertEqual(result[2], self.initial_gamemode)
-            self.assertEqual(result[3], self.initial_version)
-            self.assertEqual(result[4], self.initial_player_names)
+        # The state should still be the initial one
+        self.assertEqual(state, self.make_initial_state())
         
         # Verify no Discord notifications were sent
         self.mock_discord.assert_not_called()
@@ -342,77 +292,70 @@ class TestAPIFailureHandling(unittest.TestCase):
         # First call - API failure
         mock_session.get.side_effect = requests.exceptions.ConnectionError("Network unreachable")
         
-        result1 = monitor.check_server(
-            self.initial_online_count,
-            self.initial_server_status,
-            self.initial_gamemode,
-            self.initial_version,
-            self.initial_player_names
-        )
+        state = self.make_initial_state()
+        changed1 = monitor.check_server(state)
         
         # State should be preserved
-        self.assertEqual(result1[0], self.initial_online_count)
-        self.assertEqual(result1[1], self.initial_server_status)
+        self.assertEqual(state, self.make_initial_state())
         
         # Second call - API recovers with different state
         mock_session.get.side_effect = None
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.raise_for_status.return_value = None
-        mock_response.json.return_value = {
+        mock_session.get.return_value = make_ok_response({
             "online": True,
             "players": {"online": 7, "max": 10},
             "version": "1.21.1",
             "gamemode": "Creative"
-        }
-        mock_session.get.return_value = mock_response
+        })
         
-        result2 = monitor.check_server(
-            result1[0], result1[1], result1[2], result1[3], result1[4]
-        )
+        changed2 = monitor.check_server(state)
         
         # State should now be updated
-        self.assertEqual(result2[0], 7)  # New player count
-        self.assertEqual(result2[1], True)  # Server still online
+        self.assertEqual(state.online_count, 7)  # New player count
+        self.assertEqual(state.server_status, True)  # Server still online
+        self.assertFalse(changed1)  # Failed check reports no change
+        self.assertTrue(changed2)
         
         # Discord notification should be sent for the state change
         self.mock_discord.assert_called()
 
 
+@patch.object(monitor.logger, 'disabled', True)
 class TestDataPersistence(unittest.TestCase):
     """Test that data is not persisted during API failures."""
     
+    # State every test starts from
+    INITIAL_DATA = {
+        "online_count": 3,
+        "server_status": True,
+        "gamemode": "Survival",
+        "server_type": "BEDROCK",
+        "version": "1.20.0",
+        "player_names": []
+    }
+    
+    @classmethod
+    def setUpClass(cls):
+        """Create one data file for the class, it's rewritten before each test."""
+        temp_fd, cls.temp_path = tempfile.mkstemp(suffix='.json')
+        os.close(temp_fd)
+        cls.addClassCleanup(os.unlink, cls.temp_path)
+    
     def setUp(self):
         """Set up test fixtures."""
-        # Create a temporary file for data storage
-        self.temp_fd, self.temp_path = tempfile.mkstemp(suffix='.json')
-        
-        # Patch the DATA_FILE path
-        self.data_file_patcher = patch.object(monitor, 'DATA_FILE', self.temp_path)
-        self.data_file_patcher.start()
+        # Patch the data file path
+        data_file_patcher = patch.object(monitor.SERVERS[0], 'data_file', self.temp_path)
+        data_file_patcher.start()
+        self.addCleanup(data_file_patcher.stop)
+        reset_server_state(self)
         
         # Mock Discord webhook
-        self.discord_patcher = patch('monitor.send_discord_notification')
-        self.mock_discord = self.discord_patcher.start()
+        discord_patcher = patch('monitor.send_discord_notification')
+        self.mock_discord = discord_patcher.start()
+        self.addCleanup(discord_patcher.stop)
         
         # Save initial state to file
-        initial_data = {
-            "online_count": 3,
-            "server_status": True,
-            "gamemode": "Survival",
-            "server_type": "BEDROCK",
-            "version": "1.20.0",
-            "player_names": []
-        }
         with open(self.temp_path, 'w') as f:
-            json.dump(initial_data, f)
-    
-    def tearDown(self):
-        """Clean up test fixtures."""
-        self.discord_patcher.stop()
-        self.data_file_patcher.stop()
-        os.close(self.temp_fd)
-        os.unlink(self.temp_path)
+            json.dump(self.INITIAL_DATA, f)
     
     @patch('monitor.session')
     def test_no_data_saved_on_api_failure(self, mock_session):
@@ -425,7 +368,7 @@ class TestDataPersistence(unittest.TestCase):
         mock_session.get.side_effect = requests.exceptions.ConnectionError("Network unreachable")
         
         # Call check_server
-        monitor.check_server(3, True, "Survival", "1.20.0", set())
+        monitor.check_server(monitor.MonitorState(3, True, "Survival", "1.20.0"))
         
         # Read file content after the call
         with open(self.temp_path, 'r') as f:
@@ -433,25 +376,86 @@ class TestDataPersistence(unittest.TestCase):
         
         # Verify file was not modified
         self.assertEqual(initial_content, final_content)
+    
+    @patch.dict(monitor._state_cache, clear=True)
+    def test_load_previous_data(self):
+        """Test that saved state is loaded back, and a corrupt file falls back to defaults."""
+        state = monitor.load_previous_data()
+        self.assertEqual(state, monitor.MonitorState(3, True, "Survival", "1.20.0", frozenset(), monitor.SERVERS[0]))
+        
+        # The file is only read once per process
+        with open(self.temp_path, 'w') as f:
+            f.write("{not json")
+        self.assertEqual(monitor.load_previous_data(), state)
+        
+        monitor._state_cache.clear()
+        state = monitor.load_previous_data()
+        self.assertEqual(state, monitor.MonitorState(server=monitor.SERVERS[0]))
+    
+    @patch.dict(monitor._state_cache, clear=True)
+    @patch.object(monitor.SERVERS[0], 'etag', '"v1"')
+    @patch.object(monitor.SERVERS[0], 'last_modified', 'Wed, 01 Jan 2025 00:00:00 GMT')
+    def test_validators_survive_restart(self):
+        """Test that the API ETag and Last-Modified are saved with the state and restored on load."""
+        monitor.save_current_data(monitor.MonitorState(4, True, "Survival", "1.20.0"))
+        monitor.SERVERS[0].etag = None
+        monitor.SERVERS[0].last_modified = None
+        monitor._state_cache.clear()
+        
+        monitor.load_previous_data()
+        
+        self.assertEqual(monitor.SERVERS[0].etag, '"v1"')
+        self.assertEqual(monitor.SERVERS[0].last_modified, 'Wed, 01 Jan 2025 00:00:00 GMT')
+    
+    @patch.dict(monitor._state_cache, clear=True)
+    def test_identical_save_skips_write(self):
+        """Test that saving an unchanged state doesn't touch the file again."""
+        monitor.save_current_data(monitor.MonitorState(4, True, "Survival", "1.20.0", frozenset({"b", "a"})))
+        
+        with patch('monitor.os.replace') as mock_replace:
+            monitor.save_current_data(monitor.MonitorState(4, True, "Survival", "1.20.0", frozenset({"a", "b"})))
+            mock_replace.assert_not_called()
+        
+        with open(self.temp_path, 'r') as f:
+            saved = json.load(f)
+        self.assertEqual(saved["online_count"], 4)
+        self.assertEqual(saved["player_names"], ["a", "b"])
+        self.assertFalse(os.path.exists(self.temp_path + ".tmp"))
+    
+    @patch.dict(monitor._state_cache, clear=True)
+    def test_background_writes_coalesce_to_latest(self):
+        """Test that a backed-up write queue only writes the newest state of each file."""
+        write_queue = monitor.queue.Queue()
+        with patch.object(monitor, '_write_queue', write_queue), \
+                patch.object(monitor, '_writer_thread', Mock()):
+            monitor.save_current_data(monitor.MonitorState(1, True, "Survival", "1.20.0"))
+            monitor.save_current_data(monitor.MonitorState(2, True, "Survival", "1.20.0"))
+            
+            with patch('monitor._write_payload', wraps=monitor._write_payload) as mock_write:
+                monitor._drain_write_queue()
+        
+        mock_write.assert_called_once()
+        with open(self.temp_path, 'r') as f:
+            self.assertEqual(json.load(f)["online_count"], 2)
+        self.assertTrue(write_queue.empty())
 
 
+@patch.object(monitor.logger, 'disabled', True)
 class TestEdgeCases(unittest.TestCase):
     """Test edge cases and boundary conditions."""
     
     def setUp(self):
         """Set up test fixtures."""
         self.temp_fd, self.temp_path = tempfile.mkstemp(suffix='.json')
-        self.data_file_patcher = patch.object(monitor, 'DATA_FILE', self.temp_path)
-        self.data_file_patcher.start()
-        self.discord_patcher = patch('monitor.send_discord_notification')
-        self.mock_discord = self.discord_patcher.start()
-    
-    def tearDown(self):
-        """Clean up test fixtures."""
-        self.discord_patcher.stop()
-        self.data_file_patcher.stop()
-        os.close(self.temp_fd)
-        os.unlink(self.temp_path)
+        self.addCleanup(os.unlink, self.temp_path)
+        self.addCleanup(os.close, self.temp_fd)
+        data_file_patcher = patch.object(monitor.SERVERS[0], 'data_file', self.temp_path)
+        data_file_patcher.start()
+        self.addCleanup(data_file_patcher.stop)
+        reset_server_state(self)
+        discord_patcher = patch('monitor.send_discord_notification')
+        self.mock_discord = discord_patcher.start()
+        self.addCleanup(discord_patcher.stop)
     
     @patch('monitor.session')
     def test_first_check_with_api_failure(self, mock_session):
@@ -459,15 +463,12 @@ class TestEdgeCases(unittest.TestCase):
         # Simulate API failure on first check
         mock_session.get.side_effect = requests.exceptions.Timeout("Timeout")
         
-        # Call check_server with None as previous_server_status (first run)
-        result = monitor.check_server(0, None, "", "Unknown", set())
+        # Call check_server with None as server_status (first run)
+        state = monitor.MonitorState()
+        monitor.check_server(state)
         
         # Verify state remains as passed in
-        self.assertEqual(result[0], 0)
-        self.assertEqual(result[1], None)
-        self.assertEqual(result[2], "")
-        self.assertEqual(result[3], "Unknown")
-        self.assertEqual(result[4], set())
+        self.assertEqual(state, monitor.MonitorState())
         
         # Verify no Discord notification was sent
         self.mock_discord.assert_not_called()
@@ -479,15 +480,503 @@ class TestEdgeCases(unittest.TestCase):
         mock_session.get.side_effect = requests.exceptions.ConnectionError("Connection failed")
         
         # Call check_server with offline state
-        result = monitor.check_server(0, False, "", "1.20.0", set())
+        state = monitor.MonitorState(0, False, "", "1.20.0")
+        monitor.check_server(state)
         
         # Verify offline state is preserved
-        self.assertEqual(result[0], 0)
-        self.assertEqual(result[1], False)
+        self.assertEqual(state.online_count, 0)
+        self.assertEqual(state.server_status, False)
         
         # Verify no Discord notification was sent
         self.mock_discord.assert_not_called()
 
+    
+    @patch('monitor.session')
+    def test_null_fields_in_response(self, mock_session):
+        """Test that JSON nulls are treated like missing fields."""
+        mock_session.get.return_value = make_ok_response({
+            "online": True,
+            "players": {"online": 0, "max": 10, "list": None},
+            "version": "1.21.0",
+            "gamemode": None
+        })
+        
+        bedrock = monitor.MonitorState(0, True, "", "1.21.0")
+        java = monitor.MonitorState(0, True, "", "1.21.0")
+        monitor._check_bedrock(bedrock)
+        # Same body, so drop the Bedrock extraction for the Java check to parse it afresh
+        monitor.SERVERS[0].last_response = None
+        monitor._check_java(java)
+        
+        self.assertEqual(bedrock, monitor.MonitorState(0, True, "", "1.21.0"))
+        self.assertEqual(java, monitor.MonitorState(0, True, "", "1.21.0"))
+        self.mock_discord.assert_not_called()
+    
+    @patch('monitor.session')
+    def test_unchanged_state_skips_notifications(self, mock_session):
+        """Test that an unchanged server is reported as unchanged without saving."""
+        mock_session.get.return_value = make_ok_response({
+            "online": True,
+            "players": {"online": 4, "max": 10},
+            "version": "1.21.0",
+            "gamemode": "Survival"
+        })
+        
+        state = monitor.MonitorState(4, True, "Survival", "1.21.0")
+        with patch('monitor.save_current_data') as mock_save:
+            changed = monitor._check_bedrock(state)
+        
+        self.assertFalse(changed)
+        self.assertEqual(state, monitor.MonitorState(4, True, "Survival", "1.21.0"))
+        mock_save.assert_not_called()
+        self.mock_discord.assert_not_called()
+
+@patch.object(monitor.logger, 'disabled', True)
+class TestJavaServer(unittest.TestCase):
+    """Test notifications specific to Java servers."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_fd, self.temp_path = tempfile.mkstemp(suffix='.json')
+        self.addCleanup(os.unlink, self.temp_path)
+        self.addCleanup(os.close, self.temp_fd)
+        data_file_patcher = patch.object(monitor.SERVERS[0], 'data_file', self.temp_path)
+        data_file_patcher.start()
+        self.addCleanup(data_file_patcher.stop)
+        reset_server_state(self)
+        server_type_patcher = patch.object(monitor, 'SERVER_TYPE', 'JAVA')
+        server_type_patcher.start()
+        self.addCleanup(server_type_patcher.stop)
+        discord_patcher = patch('monitor.send_discord_notification')
+        self.mock_discord = discord_patcher.start()
+        self.addCleanup(discord_patcher.stop)
+    
+    @patch('monitor.session')
+    def test_online_message_summarizes_server_info(self, mock_session):
+        """Test that the ONLINE message lists software, plugin and mod counts."""
+        mock_session.get.return_value = make_ok_response({
+            "online": True,
+            "players": {"online": 1, "max": 20, "list": [{"name": "Notch"}]},
+            "version": "1.20.1",
+            "software": "Paper",
+            "plugins": [{"name": "a"}, {"name": "b"}],
+            "mods": [{"name": "c"}],
+            "motd": {"clean": ["A Minecraft Server"]}
+        })
+        
+        monitor._check_java(monitor.MonitorState())
+        
+        self.mock_discord.assert_called_once_with("✅ The server is now ONLINE! (1.20.1)\n"
+                                                  "Paper | 2 plugins | 1 mod\n"
+                                                  "📝 A Minecraft Server\n\n"
+                                                  "🎮 Notch joined!\n"
+                                                  "📊 1/20 players online")
+    
+    @patch('monitor.session')
+    def test_player_join_and_leave_names(self, mock_session):
+        """Test that joins and leaves are reported by name in sorted order."""
+        mock_session.get.return_value = make_ok_response({
+            "online": True,
+            "players": {"online": 3, "max": 20, "list": [
+                {"name": "Steve"}, {"name": "Alex"}, {"name": "Notch"}
+            ]},
+            "version": "1.20.1"
+        })
+        
+        state = monitor.MonitorState(2, True, "", "1.20.1", frozenset({"Notch", "Herobrine"}))
+        with patch('monitor._java_details') as mock_details:
+            monitor._check_java(state)
+        
+        # Server info is only summarized for the ONLINE message
+        mock_details.assert_not_called()
+        
+        self.mock_discord.assert_called_once_with(
+            "🎮 Alex joined!\n🎮 Steve joined!\n👋 Herobrine left.\n📊 3/20 players online"
+        )
+        self.assertEqual(state.player_names, {"Steve", "Alex", "Notch"})
+    
+    @patch('monitor.session')
+    def test_sparse_response(self, mock_session):
+        """Test that missing or empty players/motd objects are handled."""
+        mock_session.get.return_value = make_ok_response({
+            "online": True,
+            "players": None,
+            "version": "1.20.1",
+            "motd": {"clean": []}
+        })
+        
+        state = monitor.MonitorState()
+        monitor._check_java(state)
+        
+        self.mock_discord.assert_called_once_with("✅ The server is now ONLINE! (1.20.1)")
+        self.assertEqual(state, monitor.MonitorState(0, True, "", "1.20.1"))
+
+
+class TestConditionalRequests(unittest.TestCase):
+    """Test that unchanged API responses are skipped via ETag."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        reset_server_state(self)
+        discord_patcher = patch('monitor.send_discord_notification')
+        self.mock_discord = discord_patcher.start()
+        self.addCleanup(discord_patcher.stop)
+    
+    @patch('monitor.session')
+    def test_not_modified_preserves_state(self, mock_session):
+        """Test that the ETag is sent back and a 304 leaves the state untouched."""
+        mock_session.get.return_value = make_ok_response({
+            "online": True,
+            "players": {"online": 2, "max": 10},
+            "version": "1.21.0",
+            "gamemode": "Survival"
+        }, headers={"ETag": '"abc123"'})
+        
+        monitor._fetch_server_data(monitor.SERVERS[0], monitor._extract_bedrock)
+        
+        not_modified = Mock()
+        not_modified.status_code = 304
+        not_modified.raise_for_status.return_value = None
+        not_modified.headers = {}
+        mock_session.get.return_value = not_modified
+        
+        state = monitor.MonitorState(2, True, "Survival", "1.21.0")
+        changed = monitor.check_server(state)
+        
+        _, kwargs = mock_session.get.call_args
+        self.assertEqual(kwargs["headers"], {"If-None-Match": '"abc123"'})
+        not_modified.json.assert_not_called()
+        self.assertFalse(changed)
+        self.assertEqual(state, monitor.MonitorState(2, True, "Survival", "1.21.0"))
+        self.mock_discord.assert_not_called()
+    
+    @patch('monitor.session')
+    def test_last_modified_is_sent_back(self, mock_session):
+        """Test that a Last-Modified answer is sent back as If-Modified-Since."""
+        mock_session.get.return_value = make_ok_response(
+            {"online": False}, headers={"Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"}
+        )
+        
+        monitor._fetch_server_data(monitor.SERVERS[0], monitor._extract_bedrock)
+        monitor._fetch_server_data(monitor.SERVERS[0], monitor._extract_bedrock)
+        
+        _, kwargs = mock_session.get.call_args
+        self.assertEqual(kwargs["headers"], {"If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT"})
+
+
+    @patch('monitor.session')
+    def test_identical_body_is_parsed_once(self, mock_session):
+        """Test that an unchanged response body reuses what was parsed and extracted from it."""
+        mock_session.get.return_value = make_ok_response({"online": False})
+        
+        with patch('monitor.orjson.loads', wraps=monitor.orjson.loads) as mock_loads:
+            first = monitor._fetch_server_data(monitor.SERVERS[0], monitor._extract_bedrock)
+            second = monitor._fetch_server_data(monitor.SERVERS[0], monitor._extract_bedrock)
+        
+        self.assertEqual(mock_loads.call_count, 1)
+        self.assertIs(first, second)
+
+    @patch.object(monitor, 'RESPONSE_TTL', 60)
+    @patch('monitor.session')
+    def test_recent_answer_is_reused(self, mock_session):
+        """Test that checking again within RESPONSE_TTL doesn't query the API."""
+        mock_session.get.return_value = make_ok_response({"online": False})
+        
+        first = monitor._fetch_server_data(monitor.SERVERS[0], monitor._extract_bedrock)
+        second = monitor._fetch_server_data(monitor.SERVERS[0], monitor._extract_bedrock)
+        self.assertEqual(mock_session.get.call_count, 1)
+        self.assertIs(first, second)
+        
+        monitor.SERVERS[0].answered_at -= 60
+        monitor._fetch_server_data(monitor.SERVERS[0], monitor._extract_bedrock)
+        self.assertEqual(mock_session.get.call_count, 2)
+
+
+class TestRequestErrorLabels(unittest.TestCase):
+    """Test the log labels used for failed API requests."""
+    
+    def test_labels_follow_exception_hierarchy(self):
+        """Test that subclasses get the label of their closest known base class."""
+        cases = [
+            (requests.exceptions.ConnectionError(), "connection error"),
+            (requests.exceptions.SSLError(), "connection error"),
+            (requests.exceptions.ConnectTimeout(), "connection error"),
+            (requests.exceptions.ReadTimeout(), "timeout"),
+            # What the retrying adapter raises once a read timeout persists
+            (requests.exceptions.ConnectionError(MaxRetryError(
+                None, "/", ReadTimeoutError(None, "/", "Read timed out."))), "timeout"),
+            (requests.exceptions.TooManyRedirects(), "request error"),
+        ]
+        for error, label in cases:
+            self.assertEqual(monitor._request_error_label(error), label)
+
+
+class TestResponseParsing(unittest.TestCase):
+    """Test that the raw API response is parsed without the server icon."""
+    
+    def test_icon_field_is_stripped(self):
+        """Test that the icon is removed wherever it appears, leaving valid JSON."""
+        icon = "data:image/png;base64,iVBORw0KGgo\\/AAAA+=="
+        bodies = [
+            {"online": True, "icon": icon, "version": "1.21.0"},
+            {"icon": icon, "online": True, "version": "1.21.0"},
+            {"online": True, "version": "1.21.0", "icon": icon},
+        ]
+        for body in bodies:
+            raw = json.dumps(body, separators=(",", ":")).encode()
+            stripped = monitor._ICON_FIELD_RE.sub(b"", raw, count=1)
+            self.assertEqual(json.loads(stripped), {"online": True, "version": "1.21.0"})
+
+
+@patch.object(monitor, 'CHECK_INTERVAL', 300)
+@patch.object(monitor, 'MAX_CHECK_INTERVAL', 1800)
+class TestCheckInterval(unittest.TestCase):
+    """Test the adaptive polling interval."""
+    
+    def setUp(self):
+        """Start with no recorded API failures."""
+        reset_server_state(self)
+    
+    def test_regular_interval_when_idle(self):
+        """Test that a stable online server is polled at CHECK_INTERVAL."""
+        self.assertEqual(monitor.next_check_interval(True, 0, monitor.ACTIVE_CHECKS), 300)
+    
+    def test_faster_polling_after_change(self):
+        """Test that polling speeds up for a few checks after a change."""
+        self.assertEqual(monitor.next_check_interval(True, 0, 0), 75)
+        self.assertEqual(monitor.next_check_interval(True, 0, monitor.ACTIVE_CHECKS - 1), 75)
+    
+    def test_backoff_while_offline(self):
+        """Test that offline polling backs off exponentially up to the cap."""
+        intervals = [monitor.next_check_interval(False, n, 0) for n in range(1, 6)]
+        self.assertEqual(intervals, [300, 600, 1200, 1800, 1800])
+    
+    @patch.object(monitor, 'MAX_FAILURE_BACKOFF', 3600)
+    def test_backoff_with_jitter_on_api_failures(self):
+        """Test that API failures back off exponentially with +/-20% jitter."""
+        with patch('monitor.random.uniform', return_value=1.0) as mock_uniform:
+            intervals = [monitor.next_check_interval(True, 0, 0, n) for n in range(1, 6)]
+        self.assertEqual(intervals, [600, 1200, 2400, 3600, 3600])
+        mock_uniform.assert_called_with(0.8, 1.2)
+    
+    @patch('monitor.session')
+    def test_failure_count_resets_on_success(self, mock_session):
+        """Test that failed fetches are counted until the API answers again."""
+        mock_session.get.side_effect = requests.exceptions.Timeout("Timeout")
+        with patch('monitor.logger'):
+            monitor._fetch_server_data(monitor.SERVERS[0], monitor._extract_bedrock)
+            monitor._fetch_server_data(monitor.SERVERS[0], monitor._extract_bedrock)
+        self.assertEqual(monitor.SERVERS[0].consecutive_failures, 2)
+        
+        mock_response = Mock()
+        mock_response.status_code = 304
+        mock_response.raise_for_status.return_value = None
+        mock_response.headers = {}
+        mock_session.get.side_effect = None
+        mock_session.get.return_value = mock_response
+        monitor._fetch_server_data(monitor.SERVERS[0], monitor._extract_bedrock)
+        self.assertEqual(monitor.SERVERS[0].consecutive_failures, 0)
+
+    
+    def test_checks_follow_a_fixed_schedule(self):
+        """Test that time spent checking or oversleeping doesn't push later checks back."""
+        server = monitor.Server("x:1", "https://api.example/x:1", "/nonexistent/server_data.json")
+        shutdown = Mock()
+        shutdown.wait.side_effect = [False, False, True]
+        with patch('monitor.load_previous_data', return_value=monitor.MonitorState(0, True, "", "1.21.0", server=server)), \
+                patch('monitor.check_server', return_value=False), \
+                patch('monitor.next_check_interval', return_value=300), \
+                patch('monitor.time.monotonic', side_effect=[0, 2, 303, 950]), \
+                patch.object(monitor, '_shutdown', shutdown):
+            monitor.monitor_loop(server)
+        
+        # Check took 2s, the wait overslept by 3s, then a check overran the deadline
+        waits = [call_args[0][0] for call_args in shutdown.wait.call_args_list]
+        self.assertEqual(waits, [298, 297, 0])
+
+
+class TestShutdown(unittest.TestCase):
+    """Test graceful shutdown on SIGTERM."""
+    
+    @patch.object(monitor, '_shutdown', monitor.threading.Event())
+    @patch.object(monitor, '_shutdown_signal', None)
+    @patch('monitor.log')
+    def test_sigterm_ends_monitor_loop(self, mock_log):
+        """Test that SIGTERM interrupts the wait for the next check and ends the loop."""
+        server = monitor.Server("x:1", "https://api.example/x:1", "/nonexistent/server_data.json")
+        with patch('monitor.load_previous_data', return_value=monitor.MonitorState(0, True, "", "1.21.0", server=server)), \
+                patch('monitor.check_server', return_value=False) as mock_check, \
+                patch.object(monitor, 'CHECK_INTERVAL', 3600):
+            timer = monitor.threading.Timer(0.05, monitor._handle_shutdown_signal, (monitor.signal.SIGTERM, None))
+            timer.start()
+            started = monitor.time.monotonic()
+            monitor.monitor_loop(server)
+            timer.join()
+        
+        self.assertLess(monitor.time.monotonic() - started, 5)
+        mock_check.assert_called_once()
+        mock_log.assert_called_once_with("Received SIGTERM, shutting down...")
+    
+    @patch.object(monitor, '_shutdown', monitor.threading.Event())
+    @patch.object(monitor, '_shutdown_signal', None)
+    def test_signal_handler_does_not_log(self):
+        """Test that the handler only flags the shutdown, it may interrupt a log call."""
+        with patch('monitor.logger') as mock_logger:
+            monitor._handle_shutdown_signal(monitor.signal.SIGTERM, None)
+        
+        self.assertTrue(monitor._shutdown.is_set())
+        self.assertEqual(mock_logger.mock_calls, [])
+
+class TestDiscordNotifications(unittest.TestCase):
+    """Test queued Discord delivery."""
+    
+    def test_messages_coalesce_within_length_limit(self):
+        """Test that queued messages are merged without exceeding Discord's limit."""
+        with patch.object(monitor, 'DISCORD_MAX_LENGTH', 20):
+            batches = monitor._coalesce_messages(["a" * 8, "b" * 8, "c" * 8, "d" * 30])
+        self.assertEqual(batches, ["a" * 8 + "\n\n" + "b" * 8, "c" * 8, "d" * 20, "d" * 10])
+    
+    def test_oversized_message_is_split_at_lines(self):
+        """Test that a message over Discord's limit is sent in pieces split between lines."""
+        joins = "\n".join(f"🎮 Player{n:03} joined!" for n in range(120))
+        message = f"**a.example:19132**\n{joins}\n📊 120/200 players online"
+        self.assertGreater(len(message), monitor.DISCORD_MAX_LENGTH)
+        
+        batches = monitor._coalesce_messages([message])
+        
+        self.assertGreater(len(batches), 1)
+        self.assertTrue(all(len(batch) <= monitor.DISCORD_MAX_LENGTH for batch in batches))
+        self.assertEqual("\n".join(batches), message)
+    
+    def test_header_starts_every_split_piece(self):
+        """Test that a header is repeated on each piece of a split message and counted in the limit."""
+        with patch.object(monitor, 'DISCORD_MAX_LENGTH', 20):
+            batches = monitor._coalesce_messages(["a" * 8 + "\n" + "b" * 8, "c" * 8], header="**s**\n")
+        self.assertEqual(batches, ["**s**\n" + "a" * 8, "**s**\n" + "b" * 8, "**s**\n" + "c" * 8])
+    
+    @patch.object(monitor, 'DISCORD_WEBHOOK_URL', 'https://discord.example/webhook')
+    def test_send_queues_when_worker_running(self):
+        """Test that notifications are queued instead of sent inline once the worker runs."""
+        discord_queue = monitor.queue.Queue()
+        with patch.object(monitor, '_discord_queue', discord_queue), \
+                patch.object(monitor, '_discord_thread', Mock()), \
+                patch('monitor._execute_webhook') as mock_execute:
+            monitor.send_discord_notification("✅ The server is now ONLINE!")
+            mock_execute.assert_not_called()
+        self.assertEqual(discord_queue.get_nowait(), "✅ The server is now ONLINE!")
+    
+    @patch.object(monitor, 'DISCORD_WEBHOOK_URL', 'https://discord.example/webhook')
+    @patch('monitor.discord_session')
+    def test_webhook_posts_json_content(self, mock_discord_session):
+        """Test that the webhook is called with a plain JSON body over the shared session."""
+        mock_discord_session.post.return_value = Mock(status_code=204)
+        
+        with redirect_stdout(StringIO()) as stdout:
+            monitor._execute_webhook("👋 A player left.")
+        
+        mock_discord_session.post.assert_called_once_with(
+            'https://discord.example/webhook',
+            json={"content": "👋 A player left."},
+            timeout=monitor.REQUEST_TIMEOUT
+        )
+        self.assertIn("Notification sent to Discord.", stdout.getvalue())
+
+
+class TestMultipleServers(unittest.TestCase):
+    """Test monitoring several servers from one process."""
+    
+    def setUp(self):
+        """Set up two servers with their own data files."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.servers = [
+            monitor.Server(address, f"https://api.example/{address}", os.path.join(self.temp_dir.name, f"{address}.json"))
+            for address in ("a.example:19132", "b.example:19132")
+        ]
+        servers_patcher = patch.object(monitor, 'SERVERS', self.servers)
+        servers_patcher.start()
+        self.addCleanup(servers_patcher.stop)
+        discord_patcher = patch('monitor.send_discord_notification')
+        self.mock_discord = discord_patcher.start()
+        self.addCleanup(discord_patcher.stop)
+    
+    @patch.dict(monitor._state_cache, clear=True)
+    @patch('monitor.session')
+    def test_state_is_kept_per_server(self, mock_session):
+        """Test that each server is queried, saved and announced separately."""
+        mock_session.get.return_value = make_ok_response({"online": False}, headers={"ETag": '"b1"'})
+        
+        with redirect_stdout(StringIO()):
+            monitor.check_server(monitor.MonitorState(0, True, "", "1.21.0", server=self.servers[1]))
+        
+        self.assertEqual(mock_session.get.call_args[0][0], "https://api.example/b.example:19132")
+        self.mock_discord.assert_called_once_with("**b.example:19132**\n❌ The server is now OFFLINE.")
+        self.assertEqual(self.servers[1].etag, '"b1"')
+        self.assertIsNone(self.servers[0].etag)
+        self.assertFalse(os.path.exists(self.servers[0].data_file))
+        with open(self.servers[1].data_file, 'r') as f:
+            self.assertIs(json.load(f)["server_status"], False)
+    
+    @patch.dict(monitor._state_cache, clear=True)
+    @patch('monitor.session')
+    def test_server_header_once_per_post(self, mock_session):
+        """Test that a check's notifications are posted under a single server header."""
+        mock_session.get.return_value = make_ok_response({
+            "online": True,
+            "players": {"online": 2, "max": 10},
+            "version": "1.21.0",
+            "gamemode": "Survival"
+        })
+        
+        with redirect_stdout(StringIO()):
+            monitor._check_bedrock(monitor.MonitorState(server=self.servers[0]))
+        
+        self.mock_discord.assert_called_once()
+        message = self.mock_discord.call_args[0][0]
+        self.assertTrue(message.startswith("**a.example:19132**\n✅ The server is now ONLINE!"))
+        self.assertEqual(message.count("**a.example:19132**"), 1)
+        self.assertIn("ℹ️ Gamemode changed to: Survival", message)
+
+
+class TestSessionConfiguration(unittest.TestCase):
+    """Test that the API session is set up for connection reuse."""
+    
+    def test_session_sends_user_agent(self):
+        """Test that the User-Agent header is set once on the session."""
+        self.assertIn("MC-Server-Discord-Monitor", monitor.session.headers["User-Agent"])
+    
+    def test_api_pool_fits_the_monitor_threads(self):
+        """Test that the API pool keeps a connection alive for each monitor thread."""
+        adapter = monitor.session.get_adapter(monitor.SERVERS[0].api_url)
+        self.assertEqual(adapter.poolmanager.connection_pool_kw["maxsize"], max(2, len(monitor.SERVERS)))
+    
+    def test_api_retries_transient_failures(self):
+        """Test that API polls are retried quickly on server errors, but not on rate limiting or timeouts."""
+        retries = monitor.session.get_adapter(monitor.SERVERS[0].api_url).max_retries
+        self.assertTrue(retries.is_retry("GET", 503))
+        self.assertFalse(retries.is_retry("GET", 429))
+        self.assertFalse(retries.is_retry("GET", 404))
+        self.assertFalse(retries.raise_on_status)
+        self.assertEqual(retries.read, 0)
+        # A long Retry-After mustn't block the monitor thread past SIGTERM
+        self.assertFalse(retries.respect_retry_after_header)
+        
+        # The sleeps between attempts stay short enough for docker stop's grace period
+        backoffs = []
+        for _ in range(retries.total):
+            retries = retries.increment("GET", "/", error=requests.exceptions.ConnectionError())
+            backoffs.append(retries.get_backoff_time())
+        self.assertLess(sum(backoffs), 2)
+        with self.assertRaises(MaxRetryError):
+            retries.increment("GET", "/", error=requests.exceptions.ConnectionError())
+    
+    def test_discord_retries_only_safe_failures(self):
+        """Test that webhook posts are retried on rate limiting but not after a read error."""
+        retries = monitor.discord_session.get_adapter("https://discord.com/api/webhooks/1/x").max_retries
+        self.assertTrue(retries.is_retry("POST", 429))
+        self.assertFalse(retries.is_retry("POST", 500))
+        self.assertEqual(retries.read, 0)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -7,7 +7,6 @@ This script simulates different API failure scenarios and shows the behavior.
 import sys
 import os
 import tempfile
-import json
 from unittest.mock import patch, Mock
 import requests
 
@@ -19,6 +18,9 @@ os.environ['MC_SERVER'] = 'test.example.com:19132'
 
 import monitor
 
+# Each scenario simulates a separate check, don't reuse the previous API answer
+monitor.RESPONSE_TTL = 0
+
 def print_separator():
     print("\n" + "="*70 + "\n")
 
@@ -33,7 +35,7 @@ def test_scenario(scenario_name, mock_behavior, initial_state):
     
     try:
         # Patch the data file path
-        with patch.object(monitor, 'DATA_FILE', temp_path):
+        with patch.object(monitor.SERVERS[0], 'data_file', temp_path):
             # Patch Discord notifications
             with patch('monitor.send_discord_notification') as mock_discord:
                 # Patch the session
@@ -42,20 +44,20 @@ def test_scenario(scenario_name, mock_behavior, initial_state):
                     mock_behavior(mock_session)
                     
                     # Call check_server
-                    result = monitor.check_server(
+                    state = monitor.MonitorState(
                         initial_state['count'],
                         initial_state['online'],
                         initial_state['gamemode'],
-                        initial_state['version'],
-                        set()
+                        initial_state['version']
                     )
+                    monitor.check_server(state)
                     
                     # Check results
                     state_unchanged = (
-                        result[0] == initial_state['count'] and
-                        result[1] == initial_state['online'] and
-                        result[2] == initial_state['gamemode'] and
-                        result[3] == initial_state['version']
+                        state.online_count == initial_state['count'] and
+                        state.server_status == initial_state['online'] and
+                        state.gamemode == initial_state['gamemode'] and
+                        state.version == initial_state['version']
                     )
                     
                     discord_not_called = not mock_discord.called
@@ -67,7 +69,7 @@ def test_scenario(scenario_name, mock_behavior, initial_state):
                         if not state_unchanged:
                             print(f"      - State was changed!")
                             print(f"        Before: {initial_state}")
-                            print(f"        After: count={result[0]}, online={result[1]}, gamemode={result[2]}, version={result[3]}")
+                            print(f"        After: count={state.online_count}, online={state.server_status}, gamemode={state.gamemode}, version={state.version}")
                         if not discord_not_called:
                             print(f"      - Discord notification was sent!")
                     
@@ -135,7 +137,7 @@ def main():
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.raise_for_status.return_value = None
-        mock_response.json.side_effect = json.JSONDecodeError("Invalid JSON", "", 0)
+        mock_response.content = b"<html>Bad Gateway</html>"
         mock_session.get.return_value = mock_response
     
     test_results.append(test_scenario(